@@ -5,6 +5,7 @@ Using Agentic RAG system
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import tempfile
 import time
@@ -13,11 +14,17 @@ from typing import List, Tuple, Optional
 
 from strands import Agent
 from qdrant_client import QdrantClient, models
+from langchain_core.documents import Document
 from langchain_core.vectorstores import VectorStore
 
 from backend.agents.rag.loader import load_document
 from backend.agents.rag.chunker import chunk_documents
-from backend.agents.rag.vector_store import create_vector_store, create_qdrant_client
+from backend.agents.rag.vector_store import (
+    QUANTIZED_SEARCH_PARAMS,
+    BoundedVectorStore,
+    create_vector_store,
+    create_qdrant_client,
+)
 from backend.agents.rag.embedding import create_embedding_model
 from backend.agents.rag.model_loader import create_llm_model
 from backend.agents.rag.config import QDRANT_COLLECTION_NAME
@@ -54,6 +61,8 @@ class DocumentRAG:
             client=self.qdrant_client,
             collection_name=self.collection_name,
         )
+        # Async searches share a small concurrency budget against Qdrant
+        self.bounded_vector_db = BoundedVectorStore(self.vector_db)
 
     # ------------------------------------------------------------------ #
     # Document Ingestion
@@ -67,6 +76,43 @@ class DocumentRAG:
         doc_id: Optional unique ID for the document (e.g. Supabase filename)
         Returns: unique document ID
         """
+        return self.upload_documents([file], [doc_id])[0]
+
+    def upload_documents(self, files, doc_ids: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        Process several uploaded documents and add them to vector DB at once.
+
+        Chunks from all files are embedded and upserted in a single
+        add_documents call instead of one round trip per document.
+
+        files: UploadFile or file-like objects with .filename & .file
+        doc_ids: Optional IDs, one per file (None entries are generated)
+        Returns: document IDs in the same order as files
+        """
+        if doc_ids is None:
+            doc_ids = [None] * len(files)
+        elif len(doc_ids) != len(files):
+            raise ValueError("doc_ids must match the number of files")
+        else:
+            doc_ids = list(doc_ids)
+
+        all_chunks = []
+        for i, file in enumerate(files):
+            doc_ids[i], chunks = self._load_chunks(file, doc_ids[i])
+            all_chunks.extend(chunks)
+
+        if all_chunks:
+            self.vector_db.add_documents(all_chunks)
+
+        logger.info(f"Indexed {doc_ids} into collection '{self.collection_name}'")
+        return doc_ids
+
+    def _load_chunks(self, file, doc_id: Optional[str] = None) -> Tuple[str, List]:
+        """
+        Read and chunk an uploaded file, tagging chunks with doc_id and source.
+
+        Returns: (doc_id, chunks)
+        """
         filename = getattr(file, "filename", "uploaded_document")
         content = file.file.read()
         file.file.seek(0)
@@ -89,10 +135,7 @@ class DocumentRAG:
                 chunk.metadata["doc_id"] = doc_id
                 chunk.metadata["source"] = filename
 
-            self.vector_db.add_documents(chunks)
-
-            logger.info(f"Indexed '{doc_id}' into collection '{self.collection_name}'")
-            return doc_id
+            return doc_id, chunks
 
         finally:
             Path(tmp_path).unlink(missing_ok=True)
@@ -105,19 +148,10 @@ class DocumentRAG:
         self, query: str, k: int = 3, doc_id: Optional[str] = None
     ) -> Tuple[List, List[str], List[float]]:
         
-        filter_condition = None
-        if doc_id:
-            filter_condition = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="metadata.doc_id",
-                        match=models.MatchValue(value=doc_id),
-                    )
-                ]
-            )
+        filter_condition = self._doc_filter(doc_id) if doc_id else None
 
         results = self.vector_db.similarity_search_with_score(
-            query, k=k, filter=filter_condition
+            query, k=k, filter=filter_condition, search_params=QUANTIZED_SEARCH_PARAMS
         )
 
         docs = [doc for doc, _ in results]
@@ -126,20 +160,73 @@ class DocumentRAG:
 
         return docs, sources, scores
 
+    def _similarity_search_batch(
+        self, queries: List[str], k: int = 3, doc_ids: Optional[List[Optional[str]]] = None
+    ) -> List[Tuple[List, List[str], List[float]]]:
+        """
+        Run several similarity searches with one embedding call and one
+        Qdrant query_batch_points request.
+        """
+        if doc_ids is None:
+            doc_ids = [None] * len(queries)
+        elif len(doc_ids) != len(queries):
+            raise ValueError("doc_ids must match the number of queries")
+        vectors = self.embedding_model.embed_documents(list(queries))
+
+        # Match the payload layout and vector name used by QdrantVectorStore
+        content_key = getattr(self.vector_db, "content_payload_key", "page_content")
+        metadata_key = getattr(self.vector_db, "metadata_payload_key", "metadata")
+        vector_name = getattr(self.vector_db, "vector_name", None) or None
+
+        requests = [
+            models.QueryRequest(
+                query=vector,
+                using=vector_name,
+                limit=k,
+                filter=self._doc_filter(doc_id) if doc_id else None,
+                params=QUANTIZED_SEARCH_PARAMS,
+                with_payload=True,
+            )
+            for vector, doc_id in zip(vectors, doc_ids)
+        ]
+        responses = self.qdrant_client.query_batch_points(
+            collection_name=self.collection_name, requests=requests
+        )
+
+        results = []
+        for response in responses:
+            docs = [
+                Document(
+                    page_content=point.payload.get(content_key) or "",
+                    metadata=point.payload.get(metadata_key) or {},
+                )
+                for point in response.points
+            ]
+            scores = [float(point.score) for point in response.points]
+            sources = [doc.metadata.get("source", "Unknown") for doc in docs]
+            results.append((docs, sources, scores))
+
+        return results
+
+    @staticmethod
+    def _doc_filter(doc_id: str) -> models.Filter:
+        """Filter matching the chunks of a single document."""
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="metadata.doc_id",
+                    match=models.MatchValue(value=doc_id),
+                )
+            ]
+        )
+
     def delete_document(self, doc_id: str) -> bool:
         """
         Delete a document and its chunks from the vector DB.
         """
         try:
             # Create filter for the specific doc_id
-            filter_condition = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="metadata.doc_id",
-                        match=models.MatchValue(value=doc_id),
-                    )
-                ]
-            )
+            filter_condition = self._doc_filter(doc_id)
             
             # Delete points matching the filter
             self.qdrant_client.delete(
@@ -160,10 +247,62 @@ class DocumentRAG:
         """
         Query the knowledge base and return (answer, source_document_names).
         """
-
         try:
             docs, sources, _ = self._similarity_search(query, k=k, doc_id=doc_id)
+        except Exception as e:
+            logger.error(f"Vector DB retrieval error: {e}")
+            docs, sources = [], []
 
+        return self._answer(query, docs, sources)
+
+    async def aquery(self, query: str, k: int = 1, doc_id: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Async variant of query() for request handlers.
+
+        The search is throttled by bounded_vector_db, and both search and
+        answer generation run off the event loop.
+        """
+        try:
+            results = await self.bounded_vector_db.asimilarity_search_with_score(
+                query,
+                k=k,
+                filter=self._doc_filter(doc_id) if doc_id else None,
+                search_params=QUANTIZED_SEARCH_PARAMS,
+            )
+            docs = [doc for doc, _ in results]
+            sources = [doc.metadata.get("source", "Unknown") for doc in docs]
+        except Exception as e:
+            logger.error(f"Vector DB retrieval error: {e}")
+            docs, sources = [], []
+
+        return await asyncio.to_thread(self._answer, query, docs, sources)
+
+    def query_batch(
+        self, queries: List[str], k: int = 1, doc_ids: Optional[List[Optional[str]]] = None
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Query the knowledge base for several questions, retrieving context for
+        all of them in one batched search. Returns (answer, sources) per query.
+        """
+        if doc_ids is not None and len(doc_ids) != len(queries):
+            raise ValueError("doc_ids must match the number of queries")
+
+        try:
+            results = self._similarity_search_batch(queries, k=k, doc_ids=doc_ids)
+        except Exception as e:
+            logger.error(f"Vector DB retrieval error: {e}")
+            results = [([], [], [])] * len(queries)
+
+        return [
+            self._answer(query, docs, sources)
+            for query, (docs, sources, _) in zip(queries, results)
+        ]
+
+    def _answer(self, query: str, docs: List, sources: List[str]) -> Tuple[str, List[str]]:
+        """
+        Generate the structured answer for a query from its retrieved documents.
+        """
+        try:
             if not docs:
                 raise ValueError("No documents retrieved")
 
@@ -262,6 +401,13 @@ def get_document_response(query: str, doc_id: Optional[str] = None) -> Tuple[str
     rag = get_rag_instance()
     return rag.query(query, doc_id=doc_id)
 
+async def aget_document_response(query: str, doc_id: Optional[str] = None) -> Tuple[str, List[str]]:
+    """
+    Get response from Document Agent without blocking the event loop
+    """
+    rag = get_rag_instance()
+    return await rag.aquery(query, doc_id=doc_id)
+
 def process_document_upload(file, doc_id: Optional[str] = None) -> str:
     """
     Process document upload
@@ -21,9 +21,21 @@ AWS_SECRET_ACCESS_KEY: str | None = os.getenv("AWS_SECRET_ACCESS_KEY")
 # OpenAI config
 OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
 
+# Parallel embedding requests for providers without native batching (Bedrock)
+EMBEDDING_CONCURRENCY: int = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+
 # Qdrant config
 QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
 QDRANT_COLLECTION_NAME: str = os.getenv("QDRANT_COLLECTION_NAME", "documents")
+# gRPC transport (binary framing, lower per-request overhead than REST)
+QDRANT_USE_GRPC: bool = os.getenv("QDRANT_USE_GRPC", "False").lower() == "true"
+QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+# Vector quantization for new collections: "auto" (binary for >= 3072 dims,
+# int8 scalar otherwise), "scalar", "binary" or "none"
+QDRANT_QUANTIZATION: str = os.getenv("QDRANT_QUANTIZATION", "auto").lower()
+# Concurrent searches allowed per process; a single-node Qdrant saturates early.
+# With multiple uvicorn workers the effective cap is WORKERS x this value
+QDRANT_MAX_INFLIGHT: int = int(os.getenv("QDRANT_MAX_INFLIGHT", "2"))
 
 # LLM model IDs (Haiku defaults)
 BEDROCK_MODEL_ID_DEFAULT: str = os.getenv(
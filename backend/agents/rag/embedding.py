@@ -1,7 +1,8 @@
 # rag/embeddings.py
 from __future__ import annotations
 
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
 
 from langchain_aws import BedrockEmbeddings
 from langchain_openai import OpenAIEmbeddings
@@ -12,9 +13,36 @@ from .config import (
     AWS_SECRET_ACCESS_KEY,
     AWS_REGION,
     OPENAI_API_KEY,
+    EMBEDDING_CONCURRENCY,
 )
 
 
+class ConcurrentBedrockEmbeddings(BedrockEmbeddings):
+    """
+    Bedrock embeddings whose embed_documents issues InvokeModel calls in
+    parallel. Titan accepts one text per request, so the stock
+    implementation embeds chunks strictly one after another.
+
+    Cohere models batch natively (and tag inputs as documents), so they
+    keep the stock implementation.
+    """
+
+    max_workers: int = EMBEDDING_CONCURRENCY
+
+    def _is_cohere(self) -> bool:
+        provider = getattr(self, "provider", None) or self.model_id or ""
+        return "cohere" in provider.lower()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) <= 1 or self.max_workers <= 1 or self._is_cohere():
+            return super().embed_documents(texts)
+
+        # One text per call through the document path, not embed_query
+        embed_batch = super().embed_documents
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(lambda text: embed_batch([text])[0], texts))
+
+
 def create_embedding_model() -> Any:
     """
     Production-safe embedding loader with:
@@ -33,7 +61,7 @@ def create_embedding_model() -> Any:
             aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
         )
 
-        return BedrockEmbeddings(
+        return ConcurrentBedrockEmbeddings(
             client=bedrock_client,
             model_id="amazon.titan-embed-text-v2:0",
         )
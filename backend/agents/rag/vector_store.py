@@ -1,19 +1,38 @@
 # rag/vector_store.py
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+from typing import Any, List, Optional, Tuple
 
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
 from qdrant_client.models import Distance, VectorParams
 from langchain_qdrant import QdrantVectorStore
 from langchain_core.vectorstores import VectorStore
 
-from .config import QDRANT_URL, QDRANT_COLLECTION_NAME
+from .config import (
+    QDRANT_URL,
+    QDRANT_COLLECTION_NAME,
+    QDRANT_GRPC_PORT,
+    QDRANT_MAX_INFLIGHT,
+    QDRANT_QUANTIZATION,
+    QDRANT_USE_GRPC,
+)
+
+# Dimension from which binary quantization keeps enough recall to pay off
+BINARY_QUANTIZATION_MIN_DIM = 3072
+
+# Search against quantized vectors, then rescore the oversampled candidates
+# with the original vectors. Ignored by Qdrant for unquantized collections.
+QUANTIZED_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
 
 
 def create_qdrant_client() -> QdrantClient:
     return QdrantClient(
         url=QDRANT_URL,
+        prefer_grpc=QDRANT_USE_GRPC,
+        grpc_port=QDRANT_GRPC_PORT,
         # api_key=os.getenv("QDRANT_API_KEY")  # enable for cloud
     )
 
@@ -38,6 +57,49 @@ def ensure_collection(client: QdrantClient, embedding_model, collection_name: st
             size=vector_dim,
             distance=Distance.COSINE,
         ),
+        quantization_config=quantization_config(vector_dim),
+    )
+
+
+def quantization_config(vector_dim: int, mode: str = QDRANT_QUANTIZATION):
+    """
+    Build the Qdrant quantization config for a vector size.
+    Quantized vectors are kept in RAM; originals are used for rescoring.
+    """
+    if mode == "auto":
+        mode = "binary" if vector_dim >= BINARY_QUANTIZATION_MIN_DIM else "scalar"
+
+    if mode == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    if mode == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+    return None
+
+
+def enable_quantization(
+    client: QdrantClient,
+    collection_name: str = QDRANT_COLLECTION_NAME,
+    mode: str = QDRANT_QUANTIZATION,
+):
+    """
+    Quantize an existing collection in place (Qdrant rebuilds in background).
+    """
+    params = client.get_collection(collection_name).config.params.vectors
+    config = quantization_config(params.size, mode)
+    if config is None:
+        return
+
+    client.update_collection(
+        collection_name=collection_name,
+        quantization_config=config,
     )
 
 
@@ -57,3 +119,52 @@ def create_vector_store(
         collection_name=collection_name,
         embedding=embedding_model,
     )
+
+
+class BoundedVectorStore:
+    """
+    Async wrapper that caps in-flight searches against a vector store.
+
+    Searches run in worker threads so they do not block the event loop, and
+    at most `max_inflight` of them hit Qdrant at once; extra callers wait.
+    Query embedding happens before a slot is taken, so it is not throttled.
+    """
+
+    def __init__(self, store: VectorStore, max_inflight: int = QDRANT_MAX_INFLIGHT):
+        self._store = store
+        self._max_inflight = max_inflight
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def asimilarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Tuple[Any, float]]:
+        # Created on first use so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_inflight)
+
+        # Embed outside the semaphore so the cap limits Qdrant searches only,
+        # not the embedding provider round trip that precedes them
+        embeddings = getattr(self._store, "embeddings", None)
+        search_by_vector = getattr(
+            self._store, "similarity_search_with_score_by_vector", None
+        )
+        if embeddings is None or search_by_vector is None:
+            async with self._semaphore:
+                return await asyncio.to_thread(
+                    self._store.similarity_search_with_score, query, k=k, **kwargs
+                )
+
+        vector = await asyncio.to_thread(embeddings.embed_query, query)
+        async with self._semaphore:
+            return await asyncio.to_thread(search_by_vector, vector, k=k, **kwargs)
+
+
+if __name__ == "__main__":
+    # python -m backend.agents.rag.vector_store [scalar|binary]
+    import sys
+
+    enable_quantization(
+        create_qdrant_client(),
+        mode=sys.argv[1] if len(sys.argv) > 1 else QDRANT_QUANTIZATION,
+    )
+    print(f"Quantization enabled on '{QDRANT_COLLECTION_NAME}'")
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
 from pydantic import BaseModel
 from typing import List
 from pathlib import Path
 
-from backend.agents.document_agent import get_document_response, process_document_upload, process_document_deletion
+from backend.agents.document_agent import aget_document_response, process_document_upload, process_document_deletion
 from backend.core.storage import upload_file_to_storage, delete_file_from_storage
 
 router = APIRouter()
@@ -30,7 +30,7 @@ async def query_document_agent(query: DocumentQuery):
     Query the document agent for information.
     """
     try:
-        answer, sources = get_document_response(query.query, doc_id=query.document_id)
+        answer, sources = await aget_document_response(query.query, doc_id=query.document_id)
         return DocumentResponse(answer=answer, source_documents=sources)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing document query: {str(e)}")
@@ -54,15 +54,13 @@ async def upload_document(file: UploadFile = File(...)):
             )
 
         # Upload to Supabase Storage (Service Role)
-        content = await file.read()
+        # Pass the spooled upload file itself; it is rewound for the RAG pipeline
         try:
-            storage_path = upload_file_to_storage(content, file.filename)
+            storage_path = upload_file_to_storage(file.file, file.filename)
         except Exception as e:
             # Log error but maybe continue? Or fail?
             # For now, let's fail if storage fails, as we want to ensure persistence.
             raise HTTPException(status_code=500, detail=f"Failed to upload to storage: {str(e)}")
-            
-        await file.seek(0)
 
         # Let the RAG pipeline handle ingestion (saves temp file, loads, chunks)
         # Use storage_path (Supabase filename) as the doc_id to ensure consistency
@@ -88,13 +86,13 @@ async def document_agent_health():
 
 
 @router.get("/documents/list")
-async def list_documents():
+async def list_documents(limit: int = Query(100, ge=1, le=1000), offset: int = Query(0, ge=0)):
     """
-    List all uploaded documents from Supabase Storage.
+    List uploaded documents from Supabase Storage, newest first.
     """
     try:
         from backend.core.storage import list_files_in_bucket
-        files = list_files_in_bucket()
+        files = list_files_in_bucket(limit=limit, offset=offset)
         return files
     except Exception as e:
         print(f"ERROR in list_documents: {e}")
@@ -7,17 +7,43 @@ and conversation history.
 """
 import logging
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
-from collections import defaultdict
+from functools import lru_cache
+from dataclasses import dataclass, field, replace
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+from collections import Counter, OrderedDict, defaultdict
 
 from backend.chatbot.local_agent import AgentClient
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Word tokenizer shared by query and context analysis
+_WORD_RE = re.compile(r'\b\w+\b')
 
-@dataclass
+# Follow-up indicators, combined so a query is scanned once
+_FOLLOWUP_RE = re.compile('|'.join([
+    # Pronouns and references
+    r'\b(it|this|that|these|those|they|them)\b',
+    # Continuation words
+    r'\b(also|additionally|furthermore|moreover|besides)\b',
+    # Reference to previous
+    r'\b(same|previous|earlier|before|above|mentioned)\b',
+    # Questions about previous topic
+    r'\b(what about|how about|tell me more|more info|explain|clarify)\b',
+    # Short queries (often follow-ups)
+    r'^.{1,20}$',  # Very short queries
+    # Comparative language
+    r'\b(another|other|different|similar|like that)\b',
+]))
+
+
+@lru_cache(maxsize=2048)
+def _is_followup(query: str) -> bool:
+    """Memoized follow-up detection; short chat stems repeat constantly."""
+    return _FOLLOWUP_RE.search(query.lower().strip()) is not None
+
+
+@dataclass(slots=True)
 class RoutingDecision:
     """
     Represents a decision about which agent should handle a query.
@@ -112,6 +138,9 @@ class AgentRouter:
         }
     }
     
+    # Maximum number of routing decisions kept in the LRU cache
+    DECISION_CACHE_SIZE = 1024
+    
     def __init__(
         self,
         agents: Optional[Dict[str, AgentClient]] = None,
@@ -125,16 +154,23 @@ class AgentRouter:
             confidence_threshold: Minimum confidence for routing (default: 0.4)
         """
         self.agents: Dict[str, AgentClient] = agents or {}
-        self.agent_keywords: Dict[str, Set[str]] = {}
+        self.agent_keywords: Dict[str, FrozenSet[str]] = {}
         self.confidence_threshold = confidence_threshold
         
+        # Inverted keyword index across all agents, derived from agent_keywords
+        self._word_agents: Dict[str, Tuple[str, ...]] = {}
+        self._phrase_agents: Dict[str, Tuple[str, ...]] = {}
+        self._phrase_patterns: Tuple[Tuple[Pattern, Tuple[str, ...]], ...] = ()
+        
+        # LRU cache of routing decisions for repeated queries
+        self._decision_cache: "OrderedDict[tuple, RoutingDecision]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         # Initialize default keywords for known agents
         for agent_name in self.agents.keys():
             agent_key = agent_name.lower().replace(" ", "").replace("-", "").replace("_", "")
-            if agent_key in self.DEFAULT_KEYWORDS:
-                self.agent_keywords[agent_name] = self.DEFAULT_KEYWORDS[agent_key]
-            else:
-                self.agent_keywords[agent_name] = set()
+            self._set_keywords(agent_name, self.DEFAULT_KEYWORDS.get(agent_key, set()))
         
         logger.info(
             f"Initialized AgentRouter with {len(self.agents)} agents "
@@ -158,6 +194,99 @@ class AgentRouter:
             context: Optional conversation context for context-aware routing
             previous_agent: Optional name of agent that handled the previous query
             
+        Returns:
+            RoutingDecision with selected agent, confidence, and reasoning
+        """
+        # Degenerate inputs skip scoring and the cache entirely
+        if not any(self.agent_keywords.values()):
+            return RoutingDecision(
+                agent_name="root",
+                confidence=0.0,
+                reasoning="No specialized agents available",
+                fallback_agents=[]
+            )
+        if not query or query.isspace():
+            return RoutingDecision(
+                agent_name="root",
+                confidence=0.0,
+                reasoning="empty query",
+                fallback_agents=[]
+            )
+        
+        # Routing only depends on the lowercased query, so identical
+        # phrasings with the same context share a cached decision
+        query_lower = query.lower()
+        key = (query_lower, context, previous_agent, self.confidence_threshold)
+        cached = self._decision_cache.get(key)
+        if cached is not None:
+            self._decision_cache.move_to_end(key)
+            self.cache_hits += 1
+            return replace(cached, fallback_agents=list(cached.fallback_agents))
+        
+        self.cache_misses += 1
+        decision = self._route_query(query_lower, context, previous_agent)
+        
+        self._decision_cache[key] = replace(
+            decision, fallback_agents=list(decision.fallback_agents)
+        )
+        if len(self._decision_cache) > self.DECISION_CACHE_SIZE:
+            self._decision_cache.popitem(last=False)
+        
+        return decision
+    
+    def route_query_batch(
+        self,
+        queries: List[str],
+        contexts: Optional[List[Optional[str]]] = None,
+        previous_agents: Optional[List[Optional[str]]] = None
+    ) -> List[RoutingDecision]:
+        """
+        Route several queries in one call.
+        
+        Repeated queries within the batch are scored once and served from
+        the decision cache for the rest.
+        
+        Args:
+            queries: The user queries to route
+            contexts: Optional per-query conversation contexts
+            previous_agents: Optional per-query previously used agents
+        
+        Returns:
+            RoutingDecisions in the same order as queries
+        """
+        n = len(queries)
+        contexts = contexts if contexts is not None else [None] * n
+        previous_agents = previous_agents if previous_agents is not None else [None] * n
+        if len(contexts) != n or len(previous_agents) != n:
+            raise ValueError("contexts and previous_agents must match the number of queries")
+        
+        return [
+            self.route_query(query, context, previous_agent)
+            for query, context, previous_agent in zip(queries, contexts, previous_agents)
+        ]
+    
+    def clear_cache(self) -> None:
+        """
+        Drop all cached routing decisions.
+        
+        Called automatically whenever agents or their keywords change.
+        """
+        self._decision_cache.clear()
+    
+    def _route_query(
+        self,
+        query: str,
+        context: Optional[str],
+        previous_agent: Optional[str]
+    ) -> RoutingDecision:
+        """
+        Compute a routing decision without consulting the cache.
+        
+        Args:
+            query: The user's query text, already lowercased
+            context: Optional conversation context for context-aware routing
+            previous_agent: Optional name of agent that handled the previous query
+            
         Returns:
             RoutingDecision with selected agent, confidence, and reasoning
         """
@@ -166,9 +295,13 @@ class AgentRouter:
         # Calculate keyword-based scores for all agents
         keyword_scores = self._calculate_keyword_scores(query)
         
+        # Context and follow-up analysis feed both scoring and reasoning;
+        # compute each once
+        context_boost = self._analyze_context(query, context) if context else ""
+        is_followup = bool(previous_agent) and _is_followup(query)
+        
         # Apply context analysis if context is provided
         if context:
-            context_boost = self._analyze_context(query, context)
             logger.debug(f"Context analysis suggests: {context_boost}")
             
             # Boost the score of the context-suggested agent
@@ -178,13 +311,13 @@ class AgentRouter:
         # Apply sticky routing if previous agent is provided
         if previous_agent and previous_agent in keyword_scores:
             # Check if the query might be a follow-up
-            if self._is_followup_query(query):
+            if is_followup:
                 keyword_scores[previous_agent] *= 1.5  # 50% boost for sticky routing
                 logger.debug(f"Applied sticky routing boost to {previous_agent}")
         
         # Find the agent with the highest score
         if not keyword_scores:
-            # No agents available or no scores calculated
+            # No agents with keywords, nothing to score against
             return RoutingDecision(
                 agent_name="root",
                 confidence=0.0,
@@ -212,9 +345,9 @@ class AgentRouter:
         reasoning_parts = []
         if keyword_scores[best_agent] > 0:
             reasoning_parts.append(f"keyword match (score: {best_score:.2f})")
-        if context and self._analyze_context(query, context) == best_agent:
+        if context and context_boost == best_agent:
             reasoning_parts.append("context alignment")
-        if previous_agent == best_agent and self._is_followup_query(query):
+        if previous_agent == best_agent and is_followup:
             reasoning_parts.append("follow-up to previous query")
         
         reasoning = f"Selected {best_agent} based on: {', '.join(reasoning_parts)}"
@@ -258,27 +391,29 @@ class AgentRouter:
         """
         # Normalize query for matching
         query_lower = query.lower()
-        query_words = set(re.findall(r'\b\w+\b', query_lower))
+        query_words = set(_WORD_RE.findall(query_lower))
         
-        scores: Dict[str, float] = defaultdict(float)
+        scores: Dict[str, float] = {
+            agent_name: 0.0
+            for agent_name, keywords in self.agent_keywords.items()
+            if keywords
+        }
         
-        for agent_name, keywords in self.agent_keywords.items():
-            if not keywords:
-                continue
-            
-            # Count exact keyword matches
-            for keyword in keywords:
-                # Handle multi-word keywords
-                if ' ' in keyword:
-                    if keyword in query_lower:
-                        scores[agent_name] += 2.0  # Multi-word matches are stronger
-                else:
-                    if keyword in query_words:
-                        scores[agent_name] += 1.0
-            
-            # Bonus for multiple keyword matches (indicates stronger relevance)
-            if scores[agent_name] >= 3:
-                scores[agent_name] *= 1.2
+        # One pass over the query words serves every agent
+        for word in query_words:
+            for agent_name in self._word_agents.get(word, ()):
+                scores[agent_name] += 1.0
+        
+        # Multi-word matches are stronger
+        for pattern, agent_names in self._phrase_patterns:
+            if pattern.search(query_lower):
+                for agent_name in agent_names:
+                    scores[agent_name] += 2.0
+        
+        # Bonus for multiple keyword matches (indicates stronger relevance)
+        for agent_name, score in scores.items():
+            if score >= 3:
+                scores[agent_name] = score * 1.2
         
         logger.debug(f"Keyword scores: {dict(scores)}")
         return dict(scores)
@@ -301,19 +436,21 @@ class AgentRouter:
             return ""
         
         context_lower = context.lower()
+        context_words = Counter(_WORD_RE.findall(context_lower))
         
         # Count agent-related keywords in context
-        context_scores: Dict[str, int] = defaultdict(int)
+        context_scores: Dict[str, int] = dict.fromkeys(self.agent_keywords, 0)
         
-        for agent_name, keywords in self.agent_keywords.items():
-            for keyword in keywords:
-                # Count occurrences in context
-                if ' ' in keyword:
-                    context_scores[agent_name] += context_lower.count(keyword) * 2
-                else:
-                    # Use word boundary matching for single words
-                    pattern = r'\b' + re.escape(keyword) + r'\b'
-                    context_scores[agent_name] += len(re.findall(pattern, context_lower))
+        # Whole-word occurrences of single-word keywords
+        for word, count in context_words.items():
+            for agent_name in self._word_agents.get(word, ()):
+                context_scores[agent_name] += count
+        
+        for phrase, agent_names in self._phrase_agents.items():
+            occurrences = context_lower.count(phrase)
+            if occurrences:
+                for agent_name in agent_names:
+                    context_scores[agent_name] += occurrences * 2
         
         # Return agent with highest context score
         if context_scores:
@@ -336,29 +473,46 @@ class AgentRouter:
         Returns:
             True if the query appears to be a follow-up
         """
-        query_lower = query.lower().strip()
-        
-        # Follow-up indicators
-        followup_patterns = [
-            # Pronouns and references
-            r'\b(it|this|that|these|those|they|them)\b',
-            # Continuation words
-            r'\b(also|additionally|furthermore|moreover|besides)\b',
-            # Reference to previous
-            r'\b(same|previous|earlier|before|above|mentioned)\b',
-            # Questions about previous topic
-            r'\b(what about|how about|tell me more|more info|explain|clarify)\b',
-            # Short queries (often follow-ups)
-            r'^.{1,20}$',  # Very short queries
-            # Comparative language
-            r'\b(another|other|different|similar|like that)\b',
-        ]
+        return _is_followup(query)
+    
+    def _set_keywords(self, agent_name: str, keywords: AbstractSet[str]) -> None:
+        """
+        Store an agent's keywords and rebuild the keyword index.
         
-        for pattern in followup_patterns:
-            if re.search(pattern, query_lower):
-                return True
+        Args:
+            agent_name: Name of the agent
+            keywords: Keywords for routing to this agent
+        """
+        self.agent_keywords[agent_name] = frozenset(keywords)
+        self._rebuild_keyword_index()
+    
+    def _rebuild_keyword_index(self) -> None:
+        """
+        Rebuild the cross-agent keyword index from agent_keywords.
         
-        return False
+        Single-word keywords map to the agents that own them, so scoring is
+        one dictionary lookup per query word. Each multi-word keyword gets its
+        own precompiled whole-word pattern, so phrases that overlap or share
+        a start position all count. Agent changes are rare, so the index is
+        rebuilt from scratch.
+        """
+        word_agents: Dict[str, List[str]] = defaultdict(list)
+        phrase_agents: Dict[str, List[str]] = defaultdict(list)
+        
+        for agent_name, keywords in self.agent_keywords.items():
+            for keyword in keywords:
+                target = phrase_agents if ' ' in keyword else word_agents
+                target[keyword].append(agent_name)
+        
+        self._word_agents = {k: tuple(v) for k, v in word_agents.items()}
+        self._phrase_agents = {k: tuple(v) for k, v in phrase_agents.items()}
+        
+        self._phrase_patterns = tuple(
+            (re.compile(r'\b' + re.escape(phrase) + r'\b'), agent_names)
+            for phrase, agent_names in self._phrase_agents.items()
+        )
+        
+        self.clear_cache()
     
     def register_agent(
         self,
@@ -381,13 +535,13 @@ class AgentRouter:
         
         # Use provided keywords or try to get from default mappings
         if keywords:
-            self.agent_keywords[agent_name] = keywords
+            self._set_keywords(agent_name, keywords)
         else:
             agent_key = agent_name.lower().replace(" ", "").replace("-", "").replace("_", "")
             if agent_key in self.DEFAULT_KEYWORDS:
-                self.agent_keywords[agent_name] = self.DEFAULT_KEYWORDS[agent_key]
+                self._set_keywords(agent_name, self.DEFAULT_KEYWORDS[agent_key])
             else:
-                self.agent_keywords[agent_name] = set()
+                self._set_keywords(agent_name, set())
                 logger.warning(
                     f"No keywords provided for agent '{agent_name}'. "
                     "Agent registered but may not receive routed queries."
@@ -411,6 +565,7 @@ class AgentRouter:
             del self.agents[agent_name]
             if agent_name in self.agent_keywords:
                 del self.agent_keywords[agent_name]
+                self._rebuild_keyword_index()
             logger.info(f"Unregistered agent '{agent_name}'")
             return True
         
@@ -441,6 +596,6 @@ class AgentRouter:
             logger.warning(f"Cannot set keywords for unknown agent '{agent_name}'")
             return False
         
-        self.agent_keywords[agent_name] = keywords
+        self._set_keywords(agent_name, keywords)
         logger.info(f"Updated keywords for agent '{agent_name}' ({len(keywords)} keywords)")
         return True
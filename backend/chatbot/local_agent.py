@@ -12,7 +12,7 @@ from typing import Dict, List, Optional, Any
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     """
     Represents a response from a specialized agent.
@@ -65,6 +65,45 @@ class AgentClient(ABC):
         """
         pass
     
+    async def query_batch(
+        self,
+        messages: List[str],
+        context: Optional[Dict[str, Any]] = None,
+        max_concurrency: int = 8
+    ) -> List[AgentResponse]:
+        """
+        Send several queries to the agent concurrently.
+        
+        At most max_concurrency queries are in flight at once. A query that
+        raises is reported as a failed AgentResponse so it does not abort
+        the rest of the batch.
+        
+        Args:
+            messages: The queries to send to the agent
+            context: Optional context information shared by all queries
+            max_concurrency: Maximum number of concurrent queries
+        
+        Returns:
+            AgentResponses in the same order as messages
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _query_one(message: str) -> AgentResponse:
+            async with semaphore:
+                try:
+                    return await self.query(message, context=context)
+                except Exception as e:
+                    logger.error(f"Error in batch query to {self.agent_name}: {e}")
+                    return AgentResponse(
+                        content="",
+                        agent_name=self.agent_name,
+                        metadata={},
+                        success=False,
+                        error=str(e)
+                    )
+        
+        return list(await asyncio.gather(*(_query_one(m) for m in messages)))
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
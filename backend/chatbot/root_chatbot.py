@@ -5,6 +5,7 @@ This module implements the Root Chatbot that serves as the primary interface for
 routing queries to specialized agents and providing a seamless conversation experience.
 """
 import logging
+import re
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from dataclasses import dataclass, field
@@ -17,6 +18,17 @@ from backend.chatbot.agent_router import AgentRouter, RoutingDecision
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Greeting / small-talk phrases handled directly by the Root Chatbot,
+# compiled once into a single alternation instead of per-call substring scans
+GENERAL_QUERY_PATTERNS = (
+    "hello", "hi", "hey", "thanks", "thank you",
+    "what can you do", "help", "capabilities",
+    "how are you", "goodbye", "bye"
+)
+_GENERAL_QUERY_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, GENERAL_QUERY_PATTERNS)) + r")\b"
+)
+
 
 class MessageRole(str, Enum):
     """Enumeration of message roles in a conversation."""
@@ -25,7 +37,7 @@ class MessageRole(str, Enum):
     SYSTEM = "system"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Represents a single message in a conversation.
@@ -37,7 +49,7 @@ class Message:
     agent_used: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """
     Represents a response from the Root Chatbot.
@@ -179,16 +191,10 @@ Be professional, concise, and helpful in your responses."""
         Determine if message should be routed to a specialized agent.
         """
         # Simple heuristic: check for common general query patterns
-        general_patterns = [
-            "hello", "hi", "hey", "thanks", "thank you",
-            "what can you do", "help", "capabilities",
-            "how are you", "goodbye", "bye"
-        ]
-        
         message_lower = message.lower().strip()
         
         # If it's a very short greeting or thanks, probably general
-        if any(pattern in message_lower for pattern in general_patterns):
+        if _GENERAL_QUERY_RE.search(message_lower):
             if len(message.split()) <= 5:  # Short message
                 logger.debug("Message appears to be a general query (greeting/thanks)")
                 return False
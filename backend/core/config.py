@@ -1,65 +1,89 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
-import os
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    # Field names map case-insensitively to environment variables
+    # (e.g. aws_access_key_id <- AWS_ACCESS_KEY_ID), so the values are
+    # parsed once by pydantic-settings rather than via os.getenv defaults.
+
     # Anthropic API Key (for Claude models via Anthropic directly)
-    api_key: Optional[str] = os.getenv("api_key")
-    
+    api_key: Optional[str] = None
+
     # AWS Credentials for Bedrock (alternative to Anthropic API)
-    aws_access_key_id: Optional[str] = os.getenv("AWS_ACCESS_KEY_ID")
-    aws_secret_access_key: Optional[str] = os.getenv("AWS_SECRET_ACCESS_KEY")
-    aws_default_region: str = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
-    
+    aws_access_key_id: Optional[str] = None
+    aws_secret_access_key: Optional[str] = None
+    aws_default_region: str = "us-east-1"
+
     # Use Bedrock instead of Anthropic API
-    use_bedrock: bool = os.getenv("USE_BEDROCK", "False").lower() == "true"
-    
+    use_bedrock: bool = False
+
     # Bedrock model ID for Claude
-    bedrock_model_id: str = os.getenv("BEDROCK_MODEL_ID", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
-    
+    bedrock_model_id: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+
     # Bedrock Guardrails
-    bedrock_guardrail_id: Optional[str] = os.getenv("BEDROCK_GUARDRAIL_ID")
-    bedrock_guardrail_version: str = os.getenv("BEDROCK_GUARDRAIL_VERSION", "DRAFT")
-    
+    bedrock_guardrail_id: Optional[str] = None
+    bedrock_guardrail_version: str = "DRAFT"
+
     # Document processing embeddings (Bedrock or OpenAI)
-    openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
-    
+    openai_api_key: Optional[str] = None
+
     # Database
-    database_url: str = os.getenv("DATABASE_URL", "sqlite:///./enterprise_ai.db")
-    qdrant_url: str = os.getenv("QDRANT_URL", "http://localhost:6333")
-    qdrant_collection_name: str = os.getenv("QDRANT_COLLECTION_NAME", "documents")
+    database_url: str = "sqlite:///./enterprise_ai.db"
+    qdrant_url: str = "http://localhost:6333"
+    qdrant_collection_name: str = "documents"
+
 
-    
     # Supabase
-    supabase_url: Optional[str] = os.getenv("SUPABASE_URL")
-    supabase_key: Optional[str] = os.getenv("SUPABASE_KEY")
-    supabase_service_role_key: Optional[str] = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
+    supabase_url: Optional[str] = None
+    supabase_key: Optional[str] = None
+    supabase_service_role_key: Optional[str] = None
+
     # Observability - Opik
-    enable_tracing: bool = os.getenv("ENABLE_TRACING", "False").lower() == "true"
-    opik_api_key: Optional[str] = os.getenv("OPIK_API_KEY")
-    opik_workspace: Optional[str] = os.getenv("OPIK_WORKSPACE")
-    
+    enable_tracing: bool = False
+    opik_api_key: Optional[str] = None
+    opik_workspace: Optional[str] = None
+
     # Application
     app_name: str = "Enterprise AI Assistant Platform"
-    debug: bool = os.getenv("DEBUG", "False").lower() == "true"
+    debug: bool = False
     api_v1_prefix: str = "/api/v1"
-    
+    # JSON list, e.g. CORS_ORIGINS='["https://app.example.com"]'
+    cors_origins: List[str] = ["*"]
+    # Uvicorn worker processes for `python main.py` (ignored when debug
+    # reloads). Caches, metric buffers and concurrency limits are per process,
+    # so raising this multiplies them (e.g. QDRANT_MAX_INFLIGHT) and lets the
+    # user cache in one worker go stale relative to another for up to its TTL.
+    workers: int = 1
+
     # Agent settings
-    default_model: str = os.getenv("DEFAULT_MODEL", "us.anthropic.claude-3-5-haiku-20241022-v1:0")
-    max_tokens: int = int(os.getenv("MAX_TOKENS", "1028"))
-    temperature: float = float(os.getenv("TEMPERATURE", "0.3"))
-    
+    default_model: str = "us.anthropic.claude-3-5-haiku-20241022-v1:0"
+    max_tokens: int = 1028
+    temperature: float = 0.3
+
     # Agent URLs
-    employee_mcp_url: Optional[str] = os.getenv("EMPLOYEE_MCP_URL")
-    employee_agent_url: Optional[str] = os.getenv("EMPLOYEE_AGENT_URL")
-    hr_agent_port: int = int(os.getenv("HR_AGENT_PORT", "8000"))
-    analytics_mcp_url: Optional[str] = os.getenv("ANALYTICS_MCP_URL")
+    employee_mcp_url: Optional[str] = None
+    employee_agent_url: Optional[str] = None
+    hr_agent_port: int = 8000
+    analytics_mcp_url: Optional[str] = None
+
+    # Empty variables (e.g. USE_BEDROCK=${USE_BEDROCK} in docker-compose with
+    # the host var unset) fall back to the defaults instead of failing validation
+    model_config = SettingsConfigDict(
+        env_file=".env", extra="ignore", frozen=True, env_ignore_empty=True
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
 
-    class Config:
-        env_file = ".env"
-        extra = "ignore"
+    The environment and .env file are parsed on the first call only.
+    """
+    return Settings()
 
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -4,8 +4,18 @@ Opik configuration for tracing and observability.
 This module provides configuration for Opik tracing integration.
 """
 import os
-from typing import Dict, Optional
-import uuid
+import secrets
+from types import MappingProxyType
+from typing import Mapping
+
+# Environment is read once at import; it does not change at runtime
+_TRACING_ENABLED = os.getenv("ENABLE_TRACING", "false").strip().lower() == "true"
+
+_OPIK_METADATA: Mapping[str, str] = MappingProxyType({
+    "environment": os.getenv("ENVIRONMENT", "development"),
+    "service": "enterprise-ai-assistant",
+    "version": "1.0.0"
+})
 
 
 def is_tracing_enabled() -> bool:
@@ -15,21 +25,17 @@ def is_tracing_enabled() -> bool:
     Returns:
         True if tracing is enabled, False otherwise
     """
-    return os.getenv("ENABLE_TRACING", "false").lower() == "true"
+    return _TRACING_ENABLED
 
 
-def get_opik_metadata() -> Dict[str, str]:
+def get_opik_metadata() -> Mapping[str, str]:
     """
     Get Opik metadata for tracing.
     
     Returns:
-        Dictionary containing metadata for Opik tracing
+        Read-only mapping containing metadata for Opik tracing
     """
-    return {
-        "environment": os.getenv("ENVIRONMENT", "development"),
-        "service": "enterprise-ai-assistant",
-        "version": "1.0.0"
-    }
+    return _OPIK_METADATA
 
 
 def get_session_id() -> str:
@@ -37,6 +43,6 @@ def get_session_id() -> str:
     Generate or retrieve a session ID for tracing.
     
     Returns:
-        Session ID string
+        Session ID string (32 hex characters)
     """
-    return str(uuid.uuid4())
+    return secrets.token_hex(16)
@@ -1,47 +1,85 @@
-from supabase import create_client, Client
 from backend.core.config import settings
+from functools import lru_cache
+from io import BufferedReader
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
+import mimetypes
 import time
 from pathlib import Path
 
-def get_supabase_client() -> Client:
+if TYPE_CHECKING:
+    from supabase import Client
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> "Client":
     """
     Returns a Supabase client instance with Service Role privileges.
+
+    The client is created once and reused so storage calls share its
+    HTTP connection pool.
     """
     if not settings.supabase_url or not settings.supabase_service_role_key:
         raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set.")
     
+    # Imported here so the API process does not load supabase, postgrest
+    # and storage3 at startup
+    from supabase import create_client
+    
     return create_client(settings.supabase_url, settings.supabase_service_role_key)
 
-def upload_file_to_storage(file_content: bytes, filename: str, bucket_name: str = "documents") -> str:
+def upload_file_to_storage(
+    file: Union[bytes, BinaryIO],
+    filename: str,
+    bucket_name: str = "documents",
+    content_type: Optional[str] = None,
+) -> str:
     """
     Uploads a file to Supabase Storage and returns the path.
+
+    `file` may be raw bytes or a binary file object. Buffered file handles
+    (e.g. from open(path, "rb")) are streamed by the storage client; other
+    file objects are read once and rewound so the caller can reuse them.
+    The content type is guessed from the filename when not given.
     """
     client = get_supabase_client()
     
     # Generate a unique filename
     unique_filename = f"{int(time.time())}_{filename}"
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    
+    body = file
+    if not isinstance(file, (bytes, BufferedReader)):
+        start = file.tell()
+        body = file.read()
+        file.seek(start)
     
     try:
         client.storage.from_(bucket_name).upload(
             path=unique_filename,
-            file=file_content,
-            file_options={"content-type": "application/octet-stream"}
+            file=body,
+            file_options={"content-type": content_type}
         )
         return unique_filename
     except Exception as e:
         raise Exception(f"Failed to upload to Supabase: {str(e)}")
 
 
-def list_files_in_bucket(bucket_name: str = "documents") -> list:
+def list_files_in_bucket(bucket_name: str = "documents", limit: int = 100, offset: int = 0) -> list:
     """
-    Lists files in the specified Supabase Storage bucket.
+    Lists files in the specified Supabase Storage bucket, newest first.
+
+    Sorting and pagination are done by the storage API, so only one page
+    of metadata is transferred per call.
     """
     client = get_supabase_client()
     try:
-        res = client.storage.from_(bucket_name).list()
-        # Sort by created_at desc
-        res.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return res
+        return client.storage.from_(bucket_name).list(
+            path="",
+            options={
+                "limit": limit,
+                "offset": offset,
+                "sortBy": {"column": "created_at", "order": "desc"},
+            },
+        )
     except Exception as e:
         raise Exception(f"Failed to list files from Supabase: {str(e)}")
 
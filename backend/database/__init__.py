@@ -22,8 +22,10 @@ For detailed setup instructions, see:
     backend/database/SUPABASE_SETUP.md
 """
 
+from typing import Any
+
 from backend.database.supabase_client import get_supabase_client, SupabaseClient
-from backend.database.operations import DatabaseOperations, db_ops
+from backend.database.operations import DatabaseOperations
 
 __all__ = [
     'get_supabase_client',
@@ -31,3 +33,11 @@ __all__ = [
     'DatabaseOperations',
     'db_ops'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Defer creating `db_ops` (and its Supabase client) until it is used."""
+    if name == "db_ops":
+        from backend.database import operations
+        return operations.db_ops
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,7 @@ Run this once when setting up a new Supabase project.
 """
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add backend to path
@@ -18,6 +19,12 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=1)
+def _get_client(supabase_url: str, supabase_key: str) -> Client:
+    """Create the service-role client once and share its connection pool."""
+    return create_client(supabase_url, supabase_key)
+
+
 def init_database():
     """Initialize Supabase database with schema."""
     
@@ -34,7 +41,7 @@ def init_database():
     
     try:
         # Create Supabase client
-        supabase: Client = create_client(supabase_url, supabase_key)
+        supabase: Client = _get_client(supabase_url, supabase_key)
         
         # Read schema file
         schema_path = Path(__file__).parent / "supabase_schema.sql"
@@ -86,20 +93,36 @@ def verify_tables():
         return False
     
     try:
-        supabase: Client = create_client(supabase_url, supabase_key)
+        supabase: Client = _get_client(supabase_url, supabase_key)
         
         required_tables = ["users", "sessions", "messages", "agent_metrics", "documents"]
         
         print("\nVerifying tables...")
         all_exist = True
         
-        for table in required_tables:
-            try:
-                supabase.table(table).select("count").limit(1).execute()
-                print(f"✓ {table}")
-            except Exception as e:
-                print(f"✗ {table} - {e}")
-                all_exist = False
+        try:
+            # Single round trip: the schema's missing_tables() function
+            # returns the names that do not exist
+            response = supabase.rpc(
+                "missing_tables", {"table_names": required_tables}
+            ).execute()
+            missing = set(response.data or [])
+            
+            for table in required_tables:
+                if table in missing:
+                    print(f"✗ {table}")
+                    all_exist = False
+                else:
+                    print(f"✓ {table}")
+        except Exception:
+            # Function not installed (older schema): probe each table
+            for table in required_tables:
+                try:
+                    supabase.table(table).select("count").limit(1).execute()
+                    print(f"✓ {table}")
+                except Exception as e:
+                    print(f"✗ {table} - {e}")
+                    all_exist = False
         
         if all_exist:
             print("\n✓ All required tables exist!")
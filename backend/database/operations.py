@@ -4,23 +4,90 @@ Common database operations for Supabase.
 This module provides high-level functions for common database operations
 like saving metrics, querying analytics, and managing users.
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Any
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+import atexit
 import logging
+import threading
+import time
 
 from backend.database.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Cutoff timestamps are rounded to this granularity so repeat queries share
+# one formatted string (and identical filter literals)
+CUTOFF_BUCKET_SECONDS = 60
+
+
+@lru_cache(maxsize=32)
+def _bucketed_cutoff_iso(days: int, bucket: int) -> str:
+    """Format the cutoff `days` before the start of a time bucket."""
+    start = datetime.fromtimestamp(bucket * CUTOFF_BUCKET_SECONDS)
+    return (start - timedelta(days=days)).isoformat()
+
+
+def _cutoff_iso(days: int) -> str:
+    """
+    Get the ISO timestamp `days` ago, rounded down to CUTOFF_BUCKET_SECONDS.
+    
+    Args:
+        days: Number of days to look back
+        
+    Returns:
+        ISO-formatted local timestamp
+    """
+    return _bucketed_cutoff_iso(days, int(time.time()) // CUTOFF_BUCKET_SECONDS)
+
 
 class DatabaseOperations:
     """High-level database operations wrapper."""
     
+    # Agent metrics are buffered and written as multi-row inserts (one buffer
+    # per worker process)
+    METRIC_BATCH_SIZE = 500
+    METRIC_FLUSH_INTERVAL_SECONDS = 1.0
+    
+    # Rows per page when streaming metrics; must not exceed the PostgREST
+    # max-rows setting (1000 by default on Supabase)
+    METRIC_PAGE_SIZE = 1000
+    
+    # Default projections; callers may pass their own columns to widen or
+    # narrow a read. None selects every column.
+    USER_COLUMNS = ("user_id", "username", "email", "full_name", "disabled", "metadata")
+    METRIC_STATS_COLUMNS = ("agent_name", "success", "response_time_ms", "confidence_score")
+    
+    # User rows rarely change, so get_user serves repeats from memory. The
+    # cache is per process: with several workers, an update in one is only
+    # seen by the others once their entry expires
+    USER_CACHE_TTL_SECONDS = 60.0
+    USER_CACHE_MAXSIZE = 10_000
+    
     def __init__(self):
         """Initialize database operations."""
         self.client = get_supabase_client()
         if not self.client:
             logger.warning("Supabase client not available. Database operations will be disabled.")
+        
+        self._metric_buffer: deque = deque()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_lock = threading.Lock()
+        
+        # user_id -> {columns: (expires_at, row)}
+        self._user_cache: Dict[str, Dict[Optional[tuple], tuple]] = {}
+        self._user_cache_lock = threading.Lock()
+        
+        if self.client:
+            # Drain buffered metrics on interpreter shutdown
+            atexit.register(self.flush)
+    
+    @staticmethod
+    def _select_list(columns: Optional[Sequence[str]]) -> str:
+        """Build a PostgREST select list from column names."""
+        return ",".join(columns) if columns else "*"
     
     def is_available(self) -> bool:
         """Check if database is available."""
@@ -56,18 +123,24 @@ class DatabaseOperations:
             }
             
             self.client.table("users").insert(user_data).execute()
-            logger.info(f"Created user: {user_id}")
+            self._invalidate_user(user_id)
+            logger.info("Created user: %s", user_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to create user {user_id}: {e}")
+            logger.error("Failed to create user %s: %s", user_id, e)
             return False
     
-    def get_user(self, user_id: str) -> Optional[Dict]:
+    def get_user(self, user_id: str,
+                 columns: Optional[Sequence[str]] = USER_COLUMNS) -> Optional[Dict]:
         """
         Get user by ID.
         
+        Found users are cached in memory for USER_CACHE_TTL_SECONDS;
+        update_user invalidates the entry.
+        
         Args:
             user_id: User identifier
+            columns: Columns to fetch (None for all)
             
         Returns:
             User data dictionary or None
@@ -75,13 +148,21 @@ class DatabaseOperations:
         if not self.client:
             return None
         
+        key = tuple(columns) if columns else None
+        cached = self._get_cached_user(user_id, key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = self.client.table("users").select("*").eq("user_id", user_id).execute()
+            response = self.client.table("users").select(
+                self._select_list(columns)
+            ).eq("user_id", user_id).limit(1).execute()
             if response.data:
-                return response.data[0]
+                self._cache_user(user_id, key, response.data[0])
+                return dict(response.data[0])
             return None
         except Exception as e:
-            logger.error(f"Failed to get user {user_id}: {e}")
+            logger.error("Failed to get user %s: %s", user_id, e)
             return None
     
     def update_user(self, user_id: str, updates: Dict) -> bool:
@@ -100,21 +181,47 @@ class DatabaseOperations:
         
         try:
             self.client.table("users").update(updates).eq("user_id", user_id).execute()
-            logger.info(f"Updated user: {user_id}")
+            logger.info("Updated user: %s", user_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to update user {user_id}: {e}")
+            logger.error("Failed to update user %s: %s", user_id, e)
             return False
+        finally:
+            # Drop the cached row even on failure; the write may have landed
+            self._invalidate_user(user_id)
+    
+    def _get_cached_user(self, user_id: str, key: Optional[tuple]) -> Optional[Dict]:
+        """Return a copy of a cached, unexpired user row, if any."""
+        with self._user_cache_lock:
+            entry = self._user_cache.get(user_id, {}).get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return dict(entry[1])
+    
+    def _cache_user(self, user_id: str, key: Optional[tuple], row: Dict) -> None:
+        """Store a user row, evicting the oldest user when full."""
+        expires_at = time.monotonic() + self.USER_CACHE_TTL_SECONDS
+        with self._user_cache_lock:
+            if user_id not in self._user_cache and len(self._user_cache) >= self.USER_CACHE_MAXSIZE:
+                self._user_cache.pop(next(iter(self._user_cache)))
+            self._user_cache.setdefault(user_id, {})[key] = (expires_at, dict(row))
+    
+    def _invalidate_user(self, user_id: str) -> None:
+        """Forget every cached projection of a user."""
+        with self._user_cache_lock:
+            self._user_cache.pop(user_id, None)
     
     # Session Operations
     
-    def get_user_sessions(self, user_id: str, include_expired: bool = False) -> List[Dict]:
+    def get_user_sessions(self, user_id: str, include_expired: bool = False,
+                          columns: Optional[Sequence[str]] = None) -> List[Dict]:
         """
         Get all sessions for a user.
         
         Args:
             user_id: User identifier
             include_expired: Whether to include expired sessions
+            columns: Columns to fetch (None for all)
             
         Returns:
             List of session dictionaries
@@ -123,7 +230,9 @@ class DatabaseOperations:
             return []
         
         try:
-            query = self.client.table("sessions").select("*").eq("user_id", user_id)
+            query = self.client.table("sessions").select(
+                self._select_list(columns)
+            ).eq("user_id", user_id)
             
             if not include_expired:
                 query = query.eq("is_expired", False)
@@ -131,7 +240,7 @@ class DatabaseOperations:
             response = query.order("updated_at", desc=True).execute()
             return response.data
         except Exception as e:
-            logger.error(f"Failed to get sessions for user {user_id}: {e}")
+            logger.error("Failed to get sessions for user %s: %s", user_id, e)
             return []
     
     def expire_old_sessions(self, days: int = 30) -> int:
@@ -148,17 +257,15 @@ class DatabaseOperations:
             return 0
         
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
             response = self.client.table("sessions").update({
                 "is_expired": True
-            }).lt("updated_at", cutoff_date.isoformat()).eq("is_expired", False).execute()
+            }).lt("updated_at", _cutoff_iso(days)).eq("is_expired", False).execute()
             
             count = len(response.data) if response.data else 0
-            logger.info(f"Expired {count} old sessions")
+            logger.info("Expired %s old sessions", count)
             return count
         except Exception as e:
-            logger.error(f"Failed to expire old sessions: {e}")
+            logger.error("Failed to expire old sessions: %s", e)
             return 0
     
     # Agent Metrics Operations
@@ -169,7 +276,11 @@ class DatabaseOperations:
                          confidence_score: Optional[float] = None,
                          metadata: Optional[Dict] = None) -> bool:
         """
-        Save agent performance metric.
+        Queue an agent performance metric for saving.
+        
+        Metrics are buffered and written in a single multi-row insert once
+        METRIC_BATCH_SIZE rows are queued, every METRIC_FLUSH_INTERVAL_SECONDS,
+        on flush(), or at interpreter exit.
         
         Args:
             agent_name: Name of the agent
@@ -182,37 +293,100 @@ class DatabaseOperations:
             metadata: Additional metadata (optional)
             
         Returns:
-            True if successful, False otherwise
+            True if the metric was queued, False if the database is unavailable
         """
         if not self.client:
             return False
         
-        try:
-            metric_data = {
-                "agent_name": agent_name,
-                "query": query,
-                "response_time_ms": response_time_ms,
-                "success": success,
-                "session_id": session_id,
-                "error_message": error_message,
-                "confidence_score": confidence_score,
-                "metadata": metadata or {}
-            }
+        metric_data = {
+            "agent_name": agent_name,
+            "query": query,
+            "response_time_ms": response_time_ms,
+            "success": success,
+            "session_id": session_id,
+            "error_message": error_message,
+            "confidence_score": confidence_score,
+            "metadata": metadata or {}
+        }
+        
+        self._metric_buffer.append(metric_data)
+        self._ensure_flusher()
+        
+        if len(self._metric_buffer) >= self.METRIC_BATCH_SIZE:
+            self.flush()
+        return True
+    
+    def flush(self) -> int:
+        """
+        Write all buffered agent metrics in one insert.
+        
+        If the batch insert fails, each metric is retried individually.
+        
+        Returns:
+            Number of metrics written
+        """
+        if not self.client:
+            return 0
+        
+        with self._flush_lock:
+            batch = []
+            while self._metric_buffer:
+                batch.append(self._metric_buffer.popleft())
             
-            self.client.table("agent_metrics").insert(metric_data).execute()
-            return True
-        except Exception as e:
-            logger.error(f"Failed to save agent metric: {e}")
-            return False
+            if not batch:
+                return 0
+            
+            try:
+                self.client.table("agent_metrics").insert(batch).execute()
+                return len(batch)
+            except Exception as e:
+                logger.warning(
+                    "Batch insert of %s agent metrics failed, retrying per row: %s",
+                    len(batch), e
+                )
+            
+            # A multi-row insert is all-or-nothing; retry row by row so one
+            # bad metric (e.g. an unknown session_id) only loses itself
+            saved = 0
+            for metric_data in batch:
+                try:
+                    self.client.table("agent_metrics").insert(metric_data).execute()
+                    saved += 1
+                except Exception as e:
+                    logger.error("Failed to save agent metric: %s", e)
+            return saved
+    
+    def _ensure_flusher(self) -> None:
+        """Start the background thread that flushes metrics periodically."""
+        if self._flusher is not None:
+            return
+        
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="agent-metrics-flusher",
+                    daemon=True
+                )
+                self._flusher.start()
+    
+    def _flush_periodically(self) -> None:
+        """Flush buffered metrics every METRIC_FLUSH_INTERVAL_SECONDS."""
+        while True:
+            time.sleep(self.METRIC_FLUSH_INTERVAL_SECONDS)
+            if self._metric_buffer:
+                self.flush()
     
     def get_agent_performance(self, agent_name: Optional[str] = None,
-                            days: int = 7) -> List[Dict]:
+                            days: int = 7,
+                            columns: Optional[Sequence[str]] = None) -> List[Dict]:
         """
         Get agent performance metrics.
         
         Args:
             agent_name: Filter by agent name (optional)
             days: Number of days to look back
+            columns: Columns to fetch (None for all)
             
         Returns:
             List of performance metrics
@@ -221,10 +395,8 @@ class DatabaseOperations:
             return []
         
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            query = self.client.table("agent_metrics").select("*").gte(
-                "created_at", cutoff_date.isoformat()
+            query = self.client.table("agent_metrics").select(self._select_list(columns)).gte(
+                "created_at", _cutoff_iso(days)
             )
             
             if agent_name:
@@ -233,13 +405,65 @@ class DatabaseOperations:
             response = query.order("created_at", desc=True).execute()
             return response.data
         except Exception as e:
-            logger.error(f"Failed to get agent performance: {e}")
+            logger.error("Failed to get agent performance: %s", e)
             return []
     
+    def iter_agent_performance(self, agent_name: Optional[str] = None,
+                               days: int = 7,
+                               page_size: Optional[int] = None,
+                               columns: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Stream agent performance metrics page by page, oldest first.
+        
+        Only one page of rows is held in memory at a time. Ascending
+        (created_at, id) order keeps page offsets stable while new metrics
+        are being inserted.
+        
+        Args:
+            agent_name: Filter by agent name (optional)
+            days: Number of days to look back
+            page_size: Rows per request (defaults to METRIC_PAGE_SIZE)
+            columns: Columns to fetch (None for all)
+            
+        Yields:
+            Performance metric rows
+        """
+        if not self.client:
+            return
+        
+        page_size = page_size or self.METRIC_PAGE_SIZE
+        cutoff = _cutoff_iso(days)
+        offset = 0
+        
+        while True:
+            query = self.client.table("agent_metrics").select(self._select_list(columns)).gte(
+                "created_at", cutoff
+            )
+            
+            if agent_name:
+                query = query.eq("agent_name", agent_name)
+            
+            # created_at ties within a batched insert (NOW() is per
+            # transaction); the unique id keeps page boundaries stable
+            response = query.order("created_at").order("id").range(
+                offset, offset + page_size - 1
+            ).execute()
+            rows = response.data or []
+            
+            yield from rows
+            
+            if len(rows) < page_size:
+                return
+            offset += page_size
+    
     def get_agent_statistics(self, days: int = 7) -> Dict[str, Any]:
         """
         Get aggregated agent statistics.
         
+        Aggregation runs in Postgres via the agent_statistics() function, so
+        only one row per agent is transferred. If the function is not
+        installed, the raw metrics are fetched and aggregated client-side.
+        
         Args:
             days: Number of days to look back
             
@@ -250,53 +474,72 @@ class DatabaseOperations:
             return {}
         
         try:
-            metrics = self.get_agent_performance(days=days)
-            
-            stats = {}
-            for metric in metrics:
-                agent = metric["agent_name"]
-                if agent not in stats:
-                    stats[agent] = {
-                        "total_queries": 0,
-                        "successful_queries": 0,
-                        "failed_queries": 0,
-                        "total_response_time": 0,
-                        "confidence_scores": []
-                    }
-                
-                stats[agent]["total_queries"] += 1
-                if metric["success"]:
-                    stats[agent]["successful_queries"] += 1
-                else:
-                    stats[agent]["failed_queries"] += 1
-                
-                stats[agent]["total_response_time"] += metric["response_time_ms"]
-                
-                if metric.get("confidence_score"):
-                    stats[agent]["confidence_scores"].append(metric["confidence_score"])
-            
-            # Calculate averages
-            for agent, data in stats.items():
-                data["success_rate"] = (
-                    data["successful_queries"] / data["total_queries"]
-                    if data["total_queries"] > 0 else 0
-                )
-                data["avg_response_time_ms"] = (
-                    data["total_response_time"] / data["total_queries"]
-                    if data["total_queries"] > 0 else 0
-                )
-                data["avg_confidence"] = (
-                    sum(data["confidence_scores"]) / len(data["confidence_scores"])
-                    if data["confidence_scores"] else 0
-                )
-                del data["total_response_time"]
-                del data["confidence_scores"]
-            
-            return stats
+            response = self.client.rpc("agent_statistics", {"days": days}).execute()
+            return {row.pop("agent_name"): row for row in response.data or []}
+        except Exception as e:
+            logger.warning("agent_statistics() unavailable, aggregating client-side: %s", e)
+        
+        try:
+            return self._aggregate_agent_statistics(
+                self.iter_agent_performance(days=days, columns=self.METRIC_STATS_COLUMNS)
+            )
         except Exception as e:
-            logger.error(f"Failed to get agent statistics: {e}")
+            logger.error("Failed to get agent statistics: %s", e)
             return {}
     
+    @staticmethod
+    def _aggregate_agent_statistics(metrics: Iterable[Dict]) -> Dict[str, Any]:
+        """
+        Aggregate raw agent metric rows into per-agent statistics in one pass.
+        
+        Args:
+            metrics: Metric rows, e.g. from iter_agent_performance
+            
+        Returns:
+            Dictionary with statistics per agent
+        """
+        stats = {}
+        for metric in metrics:
+            agent = metric["agent_name"]
+            if agent not in stats:
+                stats[agent] = {
+                    "total_queries": 0,
+                    "successful_queries": 0,
+                    "failed_queries": 0,
+                    "total_response_time": 0,
+                    "confidence_scores": []
+                }
+            
+            stats[agent]["total_queries"] += 1
+            if metric["success"]:
+                stats[agent]["successful_queries"] += 1
+            else:
+                stats[agent]["failed_queries"] += 1
+            
+            stats[agent]["total_response_time"] += metric["response_time_ms"]
+            
+            if metric.get("confidence_score"):
+                stats[agent]["confidence_scores"].append(metric["confidence_score"])
+        
+        # Calculate averages
+        for agent, data in stats.items():
+            data["success_rate"] = (
+                data["successful_queries"] / data["total_queries"]
+                if data["total_queries"] > 0 else 0
+            )
+            data["avg_response_time_ms"] = (
+                data["total_response_time"] / data["total_queries"]
+                if data["total_queries"] > 0 else 0
+            )
+            data["avg_confidence"] = (
+                sum(data["confidence_scores"]) / len(data["confidence_scores"])
+                if data["confidence_scores"] else 0
+            )
+            del data["total_response_time"]
+            del data["confidence_scores"]
+        
+        return stats
+    
     # Document Operations
     
     def save_document_metadata(self, document_id: str, filename: str, file_type: str,
@@ -330,16 +573,65 @@ class DatabaseOperations:
             }
             
             self.client.table("documents").insert(doc_data).execute()
-            logger.info(f"Saved document metadata: {document_id}")
+            logger.info("Saved document metadata: %s", document_id)
+            return True
+        except Exception as e:
+            logger.error("Failed to save document metadata: %s", e)
+            return False
+    
+    def upsert_document(self, document_id: str, filename: str, file_type: str,
+                        file_size: int, uploaded_by: Optional[str] = None,
+                        metadata: Optional[Dict] = None, processed: bool = False,
+                        chunk_count: int = 0) -> bool:
+        """
+        Insert or update document metadata, including processing state.
+        
+        Lets ingestion record a processed document in one round trip instead
+        of save_document_metadata followed by mark_document_processed.
+        
+        Args:
+            document_id: Unique document identifier
+            filename: Original filename
+            file_type: File type/extension
+            file_size: File size in bytes
+            uploaded_by: User ID who uploaded (optional)
+            metadata: Additional metadata (optional)
+            processed: Whether the document has been processed
+            chunk_count: Number of chunks created
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client:
+            return False
+        
+        try:
+            doc_data = {
+                "document_id": document_id,
+                "filename": filename,
+                "file_type": file_type,
+                "file_size": file_size,
+                "uploaded_by": uploaded_by,
+                "processed": processed,
+                "chunk_count": chunk_count,
+                "metadata": metadata or {}
+            }
+            
+            self.client.table("documents").upsert(
+                doc_data, on_conflict="document_id"
+            ).execute()
+            logger.info("Upserted document metadata: %s", document_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to save document metadata: {e}")
+            logger.error("Failed to upsert document metadata: %s", e)
             return False
     
     def mark_document_processed(self, document_id: str, chunk_count: int) -> bool:
         """
         Mark a document as processed.
         
+        Prefer upsert_document when the document's metadata is at hand.
+        
         Args:
             document_id: Document identifier
             chunk_count: Number of chunks created
@@ -356,18 +648,20 @@ class DatabaseOperations:
                 "chunk_count": chunk_count
             }).eq("document_id", document_id).execute()
             
-            logger.info(f"Marked document {document_id} as processed")
+            logger.info("Marked document %s as processed", document_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to mark document as processed: {e}")
+            logger.error("Failed to mark document as processed: %s", e)
             return False
     
-    def get_user_documents(self, user_id: str) -> List[Dict]:
+    def get_user_documents(self, user_id: str,
+                           columns: Optional[Sequence[str]] = None) -> List[Dict]:
         """
         Get all documents uploaded by a user.
         
         Args:
             user_id: User identifier
+            columns: Columns to fetch (None for all)
             
         Returns:
             List of document metadata
@@ -376,15 +670,27 @@ class DatabaseOperations:
             return []
         
         try:
-            response = self.client.table("documents").select("*").eq(
+            response = self.client.table("documents").select(self._select_list(columns)).eq(
                 "uploaded_by", user_id
             ).order("upload_date", desc=True).execute()
             
             return response.data
         except Exception as e:
-            logger.error(f"Failed to get user documents: {e}")
+            logger.error("Failed to get user documents: %s", e)
             return []
 
 
-# Global instance
-db_ops = DatabaseOperations()
+_db_ops: Optional[DatabaseOperations] = None
+_db_ops_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Any:
+    """Create the global `db_ops` instance on first access."""
+    global _db_ops
+    if name == "db_ops":
+        if _db_ops is None:
+            with _db_ops_lock:
+                if _db_ops is None:
+                    _db_ops = DatabaseOperations()
+        return _db_ops
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
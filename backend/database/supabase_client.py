@@ -4,23 +4,25 @@ Supabase client singleton for the application.
 This module provides a centralized Supabase client instance
 that can be used throughout the application.
 """
-from typing import Optional
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Optional
 import logging
 
 from backend.core.config import settings
 
+if TYPE_CHECKING:
+    from supabase import Client, ClientOptions
+
 logger = logging.getLogger(__name__)
 
 
 class SupabaseClient:
     """Singleton Supabase client manager."""
     
-    _instance: Optional[Client] = None
+    _instance: Optional["Client"] = None
     _initialized: bool = False
     
     @classmethod
-    def get_client(cls) -> Optional[Client]:
+    def get_client(cls) -> Optional["Client"]:
         """
         Get or create the Supabase client instance.
         
@@ -40,9 +42,14 @@ class SupabaseClient:
             return None
         
         try:
+            # Imported here so processes that never touch the database skip
+            # loading supabase, postgrest, storage3, realtime and friends
+            from supabase import create_client
+            
             cls._instance = create_client(
                 settings.supabase_url,
-                settings.supabase_key
+                settings.supabase_key,
+                options=cls._build_options()
             )
             cls._initialized = True
             logger.info("Supabase client initialized successfully")
@@ -52,6 +59,29 @@ class SupabaseClient:
             cls._initialized = True
             return None
     
+    @staticmethod
+    def _build_options() -> "ClientOptions":
+        """
+        Build client options backed by a pooled HTTP/2 httpx client.
+        
+        The httpx client lives as long as the singleton, so PostgREST calls
+        reuse warm connections instead of repeating TCP/TLS setup.
+        """
+        import httpx
+        from supabase import ClientOptions
+        
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(5.0)
+        )
+        try:
+            return ClientOptions(httpx_client=http_client)
+        except TypeError:
+            # Older supabase-py releases cannot take a shared httpx client
+            http_client.close()
+            return ClientOptions()
+    
     @classmethod
     def reset(cls):
         """Reset the client instance (useful for testing)."""
@@ -59,7 +89,7 @@ class SupabaseClient:
         cls._initialized = False
 
 
-def get_supabase_client() -> Optional[Client]:
+def get_supabase_client() -> Optional["Client"]:
     """
     Convenience function to get the Supabase client.
     
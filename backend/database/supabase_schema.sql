@@ -79,6 +79,9 @@ CREATE INDEX IF NOT EXISTS idx_agent_metrics_session_id ON agent_metrics(session
 CREATE INDEX IF NOT EXISTS idx_agent_metrics_agent_name ON agent_metrics(agent_name);
 CREATE INDEX IF NOT EXISTS idx_agent_metrics_created_at ON agent_metrics(created_at);
 CREATE INDEX IF NOT EXISTS idx_agent_metrics_success ON agent_metrics(success);
+-- Covering index so agent_statistics() can aggregate with an index-only scan
+CREATE INDEX IF NOT EXISTS idx_agent_metrics_created_at_stats ON agent_metrics(created_at)
+    INCLUDE (agent_name, success, response_time_ms, confidence_score);
 
 -- Document metadata table (for RAG system)
 CREATE TABLE IF NOT EXISTS documents (
@@ -121,6 +124,14 @@ CREATE TRIGGER update_sessions_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Function to check which of the given tables are missing (used by init_supabase.py verify)
+CREATE OR REPLACE FUNCTION missing_tables(table_names TEXT[])
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(name), ARRAY[]::TEXT[])
+    FROM unnest(table_names) AS name
+    WHERE to_regclass('public.' || name) IS NULL;
+$$ LANGUAGE sql STABLE;
+
 -- Row Level Security (RLS) policies
 -- Enable RLS on all tables
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
@@ -212,6 +223,99 @@ FROM agent_metrics
 WHERE created_at > NOW() - INTERVAL '7 days'
 GROUP BY agent_name;
 
+-- Hourly per-agent rollup of completed hours, so statistics read a few
+-- buckets instead of rescanning agent_metrics. Sums and counts (not averages)
+-- are stored so buckets can be combined exactly.
+CREATE MATERIALIZED VIEW IF NOT EXISTS agent_stats_hourly AS
+SELECT
+    agent_name,
+    date_trunc('hour', created_at) AS bucket,
+    COUNT(*) AS total_queries,
+    COUNT(*) FILTER (WHERE success) AS successful_queries,
+    SUM(response_time_ms) AS response_time_sum,
+    COUNT(response_time_ms) AS response_time_count,
+    SUM(NULLIF(confidence_score, 0)) AS confidence_sum,
+    COUNT(NULLIF(confidence_score, 0)) AS confidence_count
+FROM agent_metrics
+WHERE created_at < date_trunc('hour', NOW())
+GROUP BY 1, 2;
+
+-- Unique index required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_stats_hourly_agent_bucket ON agent_stats_hourly(agent_name, bucket);
+CREATE INDEX IF NOT EXISTS idx_agent_stats_hourly_bucket ON agent_stats_hourly(bucket);
+
+CREATE OR REPLACE FUNCTION refresh_agent_stats_hourly()
+RETURNS VOID AS $$
+    REFRESH MATERIALIZED VIEW CONCURRENTLY agent_stats_hourly;
+$$ LANGUAGE sql;
+
+-- Refresh shortly after every hour when pg_cron is enabled
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+        PERFORM cron.schedule('refresh-agent-stats-hourly', '5 * * * *', 'SELECT refresh_agent_stats_hourly()');
+    END IF;
+END;
+$$;
+
+-- Per-agent statistics over the last N days (used by DatabaseOperations.get_agent_statistics).
+-- Materialized hours come from agent_stats_hourly; anything newer than the
+-- last materialized bucket is aggregated from agent_metrics directly, so
+-- results stay current between refreshes. The window starts on an hour boundary.
+CREATE OR REPLACE FUNCTION agent_statistics(days INTEGER DEFAULT 7)
+RETURNS TABLE (
+    agent_name TEXT,
+    total_queries BIGINT,
+    successful_queries BIGINT,
+    failed_queries BIGINT,
+    success_rate FLOAT,
+    avg_response_time_ms FLOAT,
+    avg_confidence FLOAT
+) AS $$
+    WITH bounds AS (
+        SELECT
+            date_trunc('hour', NOW() - make_interval(days => agent_statistics.days)) AS since,
+            COALESCE(
+                (SELECT MAX(bucket) + INTERVAL '1 hour' FROM agent_stats_hourly),
+                '-infinity'::timestamptz
+            ) AS materialized_until
+    ),
+    parts AS (
+        SELECT
+            h.agent_name,
+            h.total_queries,
+            h.successful_queries,
+            h.response_time_sum,
+            h.response_time_count,
+            h.confidence_sum,
+            h.confidence_count
+        FROM agent_stats_hourly h, bounds b
+        WHERE h.bucket >= b.since
+        UNION ALL
+        SELECT
+            m.agent_name,
+            COUNT(*),
+            COUNT(*) FILTER (WHERE m.success),
+            SUM(m.response_time_ms),
+            COUNT(m.response_time_ms),
+            SUM(NULLIF(m.confidence_score, 0)),
+            COUNT(NULLIF(m.confidence_score, 0))
+        FROM agent_metrics m, bounds b
+        WHERE m.created_at >= GREATEST(b.since, b.materialized_until)
+        GROUP BY m.agent_name
+    )
+    SELECT
+        p.agent_name,
+        SUM(p.total_queries)::bigint AS total_queries,
+        SUM(p.successful_queries)::bigint AS successful_queries,
+        (SUM(p.total_queries) - SUM(p.successful_queries))::bigint AS failed_queries,
+        SUM(p.successful_queries)::float / SUM(p.total_queries) AS success_rate,
+        COALESCE(SUM(p.response_time_sum)::float / NULLIF(SUM(p.response_time_count), 0), 0) AS avg_response_time_ms,
+        COALESCE(SUM(p.confidence_sum) / NULLIF(SUM(p.confidence_count), 0), 0)::float AS avg_confidence
+    FROM parts p
+    GROUP BY p.agent_name;
+$$ LANGUAGE sql STABLE;
+
 -- Comments for documentation
 COMMENT ON TABLE users IS 'Stores user account information';
 COMMENT ON TABLE sessions IS 'Stores conversation sessions with metadata';